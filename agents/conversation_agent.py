@@ -1,15 +1,20 @@
 from agents.trip_planner_agent import trip_planner_node
+from atexit import register
 from classTypes.class_types import TripPlannerState
-from concurrent.futures import ThreadPoolExecutor
-from json import loads
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import StateGraph, END
 from prompts import format_prompt, PromptType
-from re import search, DOTALL
+from re import compile, IGNORECASE
+from threading import Lock
 from typing import Dict, Any, List
 from tools.destination import get_destination_tool
-from utils.intelligent_intent import IntelligentIntentClassifier, SemanticQueryClassifier
-from utils.set_llm import get_llm
+from utils.config import WARM_GRAPH
+from utils.json_extract import extract_json
+from utils.intelligent_intent import IntelligentIntentClassifier, SemanticQueryClassifier, is_smalltalk
+from utils.llm_cache import cached_invoke
+from utils.set_llm import get_llm, invoke_first_word
 from utils.safety import (
     screen_user_input_safety, 
     validate_response_safety, 
@@ -19,6 +24,57 @@ from utils.safety import (
 
 ConversationAgentState = TripPlannerState
 
+# Keyword fallbacks for when the semantic LLM checks fail, compiled into single-pass scanners
+_NEW_TRIP_SIGNALS_RE = compile(r'new trip|different destination|start over')
+_NON_PLANNING_QUERIES_RE = compile(r'weather today|what can you do|help me|your capabilities')
+# Single-word follow-up cues are matched per token rather than by substring search
+_FOLLOWUP_KEYWORDS = frozenset({'more', 'other', 'others', 'another', 'else', 'additional', 'alternative', 'alternatives'})
+_WORD_RE = compile(r"[a-z']+")
+
+# Trip slots reset when the user starts planning a different trip
+_TRIP_SLOT_KEYS = ('destination', 'user_city', 'number_of_travelers', 'duration_days', 'start_date')
+
+# Unambiguous phrasings that can be classified without the intent LLM round-trip
+# Explore triggers only match requests for a destination, never for places within one
+_EXPLORE_TRIGGERS_RE = compile(r"\b(?:suggest|recommend)\w* (?:some |any |a )?(?:destinations?|places to (?:travel|go|visit))\b(?! (?:in|near|around|at)\b)|where should (?:i|we) (?:go|travel)(?: (?:on|for) (?:a |my |our )?(?:trip|vacation|holiday))?\W*$|\b(?:destination|travel) (?:ideas|suggestions)\b")
+# Plan triggers only match imperative requests at the start of the message; questions go to the classifier
+_PLAN_TRIGGERS_RE = compile(r"(?:(?:please|help me|i want to|i'd like to|i would like to|let's|lets) )?(?:plan|book) (?:a |an |my |our )?(?:\w+ )?(?:trip|vacation|holiday|getaway) to \w")
+_QUESTION_RE = compile(r"\?\s*$|^(?:how|what|what's|when|where|why|which|who|should|shall|is|are|do|does|can|could|would|will)\b")
+_MORE_SUGGESTIONS_RE = compile(r'(?:show me |give me |suggest |any )?(?:some |a few )?(?:more|other|different) (?:options|suggestions|places|destinations|ideas)\W*')
+_FAST_PATH_MAX_WORDS = 12
+_NEGATION_RE = compile(r"\b(?:not|no|never|dont|wont|cant)\b|n't\b")
+
+# (tool result key, trip summary label, fallback phrase) for the general trip inquiry
+_TRIP_INFO_SECTIONS = (
+    ('flights', 'Flight options', 'flight options'),
+    ('weather', 'Weather forecast', 'weather forecast'),
+    ('activities', 'Activity suggestions', 'activity suggestions'),
+    ('nearby', 'Nearby places', 'nearby places'),
+    ('budget', 'Budget breakdown', 'budget breakdown'),
+)
+
+# Failure markers in the text returned by the weather and nearby-places tools
+_WEATHER_ERROR_RE = compile(r'error', IGNORECASE)
+_NEARBY_ERROR_RE = compile(r'error|not found', IGNORECASE)
+
+# Shared pool for the per-turn LLM fan-outs, instead of building a new executor on every call
+_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="conv-agent")
+register(_POOL.shutdown)
+
+# (extraction field, context key) pairs carried forward across turns, newest items first
+_CARRIED_CONTEXT_KEYS = (
+    ('recent_mentions', '_recent_mentions'),
+    ('geographic_context', '_geographic_context'),
+    ('temporal_context', '_temporal_context'),
+    ('geographic_constraints', '_geographic_constraints'),
+)
+_MAX_CARRIED_CONTEXT_ITEMS = 10
+
+# Built-in replies are fixed text we wrote, so they never need the response safety check
+_ASK_DESTINATION_RESPONSE = "Which destination would you like me to plan for? I can help you choose from the places we discussed or somewhere completely new!"
+_DEFAULT_RESPONSE = "I'm here to help you plan amazing trips! What kind of adventure are you thinking about?"
+_CANNED_RESPONSES = frozenset({_ASK_DESTINATION_RESPONSE, _DEFAULT_RESPONSE})
+
 
 def _has_active_planning_context(context: Dict[str, Any], user_input: str) -> bool:
     """
@@ -31,68 +87,81 @@ def _has_active_planning_context(context: Dict[str, Any], user_input: str) -> bo
     if not has_basic_context:
         return False
     
-    # Use LLM to intelligently detect if user wants a new trip
-    llm = get_llm(temperature=0.1)  # Low temperature for consistent classification
-    
-    prompt = format_prompt(
+    # Use LLM to intelligently detect if user wants a new trip, and whether this is a
+    # non-planning query that should use normal intent classification. Both checks are
+    # independent, so issue them together before waiting on either.
+    new_trip_prompt = format_prompt(
         PromptType.NEW_TRIP_DETECTION,
         user_input=user_input,
         current_destination=context.get('destination', 'Unknown')
     )
+    non_planning_prompt = format_prompt(
+        PromptType.NON_PLANNING_DETECTION,
+        user_input=user_input
+    )
+    
+    # Low temperature for consistent classification; only the yes/no label is needed
+    new_trip_future = _POOL.submit(invoke_first_word, new_trip_prompt, temperature=0.1)
+    non_planning_future = _POOL.submit(invoke_first_word, non_planning_prompt, temperature=0.1)
     
     try:
-        response = llm.invoke(prompt).content.strip().lower()
-        wants_new_trip = response == 'yes'
+        wants_new_trip = new_trip_future.result() == 'yes'
         
         # If user wants new trip, clear old context immediately
         if wants_new_trip and has_basic_context:
-            keys_to_clear = ['destination', 'user_city', 'number_of_travelers', 'duration_days', 'start_date']
-            for key in keys_to_clear:
+            for key in _TRIP_SLOT_KEYS:
                 context.pop(key, None)
             return False  # Use normal intent classification for new trip
     except Exception:
         # Fallback to basic keyword detection as last resort
-        fallback_signals = ['new trip', 'different destination', 'start over']
-        wants_new_trip = any(signal in user_input.lower() for signal in fallback_signals)
+        wants_new_trip = bool(_NEW_TRIP_SIGNALS_RE.search(user_input.lower()))
         if wants_new_trip:
-            keys_to_clear = ['destination', 'user_city', 'number_of_travelers', 'duration_days', 'start_date']
-            for key in keys_to_clear:
+            for key in _TRIP_SLOT_KEYS:
                 context.pop(key, None)
             return False
     
-    # Use LLM to detect non-planning queries that should use normal intent classification
-    prompt = format_prompt(
-        PromptType.NON_PLANNING_DETECTION,
-        user_input=user_input
-    )
-    
     try:
-        response = llm.invoke(prompt).content.strip().lower()
-        is_non_planning = response == 'yes'
+        is_non_planning = non_planning_future.result() == 'yes'
     except Exception:
         # Fallback to basic keyword detection
-        fallback_queries = ['weather today', 'what can you do', 'help me', 'your capabilities']
-        is_non_planning = any(query in user_input.lower() for query in fallback_queries)
+        is_non_planning = bool(_NON_PLANNING_QUERIES_RE.search(user_input.lower()))
     
     # Continue planning if we have context and user isn't starting over or asking general questions
     return has_basic_context and not wants_new_trip and not is_non_planning
 
 
-def _classify_user_intent(user_input: str, chat_history: List[Dict[str,str]]) -> Dict[str, Any]:
+def _classify_user_intent(user_input: str, chat_history: List[Dict[str,str]], context: Dict[str, Any]) -> Dict[str, Any]:
     """Use intelligent LLM-based intent classification instead of hardcoded keywords"""
+    # Short, unambiguous requests skip the LLM; everything else takes the semantic path.
+    # With a planned trip in context, or a negation in the message, the phrasing alone is
+    # not enough to tell the intent, so those always go to the classifier.
+    user_lower = user_input.lower()
+    has_trip = bool(context.get('last_trip_data') or context.get('tool_results'))
+    if not has_trip and len(user_lower.split()) < _FAST_PATH_MAX_WORDS and not _NEGATION_RE.search(user_lower):
+        if _EXPLORE_TRIGGERS_RE.search(user_lower):
+            return {'intent': 'explore', 'exploring': 'destinations', 'planning_destination': None, 'ready_to_plan': False}
+        if _PLAN_TRIGGERS_RE.match(user_lower.strip()) and not _QUESTION_RE.search(user_lower.strip()):
+            return {'intent': 'plan', 'exploring': None, 'planning_destination': None, 'ready_to_plan': True}
+        # "More options" only means more destinations right after we listed destinations
+        if context.get('_suggested_destinations') and _MORE_SUGGESTIONS_RE.fullmatch(user_lower.strip()):
+            return {'intent': 'explore', 'exploring': 'destinations', 'planning_destination': None, 'ready_to_plan': False}
+    
     return IntelligentIntentClassifier.classify_intent(user_input, chat_history)
 
+def _explores_destinations(intent_data: Dict[str, Any]) -> bool:
+    """Whether an explore intent is answered with destination suggestions"""
+    exploring = (intent_data.get('exploring') or '').lower()
+    return 'destination' in exploring or 'places' in exploring or not exploring
+
 def _handle_exploration(user_input: str, intent_data: Dict[str, Any], context: Dict[str, Any]) -> str:
     """Handle exploration requests - suggestions, browsing, etc. with async optimization"""
     
-    exploring = (intent_data.get('exploring') or '').lower()
-    
-    if 'destination' in exploring or 'places' in exploring or not exploring:
+    if _explores_destinations(intent_data):
         # Use destination suggestion tool with parallel LLM processing
         try:
+            dest_tool = get_destination_tool()
+            
             def get_suggestions():
-                dest_tool = get_destination_tool()
-                
                 # Enhanced input with context awareness
                 enhanced_input = user_input
                 
@@ -133,18 +202,19 @@ def _handle_exploration(user_input: str, intent_data: Dict[str, Any], context: D
                 return llm.invoke(prompt).content.strip()
             
             # Run both operations in parallel
-            with ThreadPoolExecutor(max_workers=2) as executor:
-                suggestions_future = executor.submit(get_suggestions)
-                intro_future = executor.submit(get_context_response)
-                
-                # Get results with timeout
-                try:
-                    suggestions = suggestions_future.result(timeout=10)
-                    intro = intro_future.result(timeout=5)
-                except Exception:
-                    # Fallback if parallel execution fails
-                    suggestions = get_suggestions()
-                    intro = "Here are some great destination ideas for you:"
+            suggestions_future = _POOL.submit(get_suggestions)
+            intro_future = _POOL.submit(get_context_response)
+            
+            # Bounded wait on both together; already-submitted work is never re-run synchronously
+            done, _ = wait((suggestions_future, intro_future), timeout=10)
+            
+            # The intro is cosmetic, so fall back to a static line if it failed or is still running
+            intro = "Here are some great destination ideas for you:"
+            if intro_future in done and intro_future.exception() is None:
+                intro = intro_future.result()
+            
+            # Give slow suggestions a short grace period; failures fall through to the generic reply below
+            suggestions = suggestions_future.result(timeout=5)
             
             # Combine results
             response = f"{intro}\n\n{suggestions}\n\nWhich of these catches your interest? Just tell me the destination name when you're ready to start planning!"
@@ -169,10 +239,9 @@ def _handle_general_chat(user_input: str, context: Dict[str, Any]) -> str:
     """Handle general conversation, greetings, and any non-travel topics intelligently"""
     
     # Check if user is asking about specific aspects of their previous trip planning
-    if _is_trip_specific_inquiry(user_input, context):
-        return _handle_trip_specific_inquiry(user_input, context)
-    
-    llm = get_llm()
+    trip_response = _classify_and_route_trip(user_input, context)
+    if trip_response is not None:
+        return trip_response
     
     # Enhanced prompt to handle any topic and naturally steer to travel
     prompt = format_prompt(
@@ -181,34 +250,32 @@ def _handle_general_chat(user_input: str, context: Dict[str, Any]) -> str:
     )
     
     try:
-        return llm.invoke(prompt).content.strip()
+        return cached_invoke(PromptType.GENERAL_CHAT, prompt).strip()
     except Exception:
         return "Hello! I'm your travel planning assistant. I'm here to help you discover amazing destinations and plan unforgettable trips. What kind of adventure interests you?"
 
 
-def _is_trip_specific_inquiry(user_input: str, context: Dict[str, Any]) -> bool:
-    """Use semantic classification to detect trip-specific inquiries"""
+def _classify_and_route_trip(user_input: str, context: Dict[str, Any]) -> str | None:
+    """
+    Answer specific questions about the previously planned trip.
+    Classifies the query once and dispatches to the matching handler; returns None when
+    there is no planned trip or the question isn't about it, so general chat can take over.
+    """
     
     # Must have previous trip data to answer specific questions
     if not context.get('last_trip_data') or not context.get('tool_results'):
-        return False
-    
-    # Use semantic classifier to determine if this is a travel-related query
-    query_type = SemanticQueryClassifier.classify_travel_query(user_input, context.get('last_trip_data', {}))
-    
-    # Any specific travel query type (not 'general') indicates trip-specific inquiry
-    return query_type != 'general'
-
-
-def _handle_trip_specific_inquiry(user_input: str, context: Dict[str, Any]) -> str:
-    """Handle specific questions about different aspects of the planned trip using semantic classification"""
+        return None
     
     last_trip_data = context.get('last_trip_data', {})
     tool_results = context.get('tool_results', {})
-
+    
     # Use semantic classifier to determine the specific type of travel query
     query_type = SemanticQueryClassifier.classify_travel_query(user_input, last_trip_data)
     
+    # Any specific travel query type (not 'general') indicates trip-specific inquiry
+    if query_type == 'general':
+        return None
+    
     # Route to appropriate handler based on semantic classification
     if query_type == 'weather':
         return _handle_weather_inquiry(user_input, last_trip_data, tool_results)
@@ -220,7 +287,7 @@ def _handle_trip_specific_inquiry(user_input: str, context: Dict[str, Any]) -> s
         return _handle_budget_inquiry(user_input, last_trip_data, tool_results)
     elif query_type == 'flights':
         return _handle_flight_inquiry(user_input, context)
-    elif query_type in ['accommodation', 'food']:
+    elif query_type in ('accommodation', 'food'):
         # Handle accommodation and food queries with general trip inquiry for now
         return _handle_general_trip_inquiry(user_input, last_trip_data, tool_results)
     else:
@@ -228,6 +295,15 @@ def _handle_trip_specific_inquiry(user_input: str, context: Dict[str, Any]) -> s
         return _handle_general_trip_inquiry(user_input, last_trip_data, tool_results)
 
 
+def _is_tool_error(tool_data: Any, error_re) -> bool:
+    """Check a stored tool result for failure without serializing and lower-casing it first"""
+    if isinstance(tool_data, dict):
+        return 'error' in tool_data or tool_data.get('status') == 'error'
+    if isinstance(tool_data, str):
+        return error_re.search(tool_data) is not None
+    return error_re.search(str(tool_data)) is not None
+
+
 def _handle_weather_inquiry(user_input: str, trip_data: dict, tool_results: dict) -> str:
     """Handle weather-related questions using LLM for natural responses"""
     
@@ -238,11 +314,10 @@ def _handle_weather_inquiry(user_input: str, trip_data: dict, tool_results: dict
     if not weather_data:
         return f"I don't have weather information for {destination} from our previous planning. Would you like me to check the current weather forecast?"
     
-    if 'error' in str(weather_data).lower():
+    if _is_tool_error(weather_data, _WEATHER_ERROR_RE):
         return f"I had trouble getting weather data for {destination} earlier: {weather_data}. Would you like me to try again?"
     
     # Use LLM to generate natural response
-    llm = get_llm()
     prompt = format_prompt(
         PromptType.WEATHER_INQUIRY,
         user_input=user_input,
@@ -252,8 +327,7 @@ def _handle_weather_inquiry(user_input: str, trip_data: dict, tool_results: dict
     )
     
     try:
-        response = llm.invoke(prompt)
-        return str(getattr(response, 'content', response))
+        return cached_invoke(PromptType.WEATHER_INQUIRY, prompt)
     except Exception:
         # Fallback to basic response
         return f"Here's the weather for your {destination} trip: {weather_data}"
@@ -269,7 +343,6 @@ def _handle_activity_inquiry(user_input: str, trip_data: dict, tool_results: dic
         return f"I don't have activity suggestions for {destination} from our previous planning. Would you like me to suggest some activities for you?"
     
     # Use LLM to generate natural response
-    llm = get_llm()
     prompt = format_prompt(
         PromptType.ACTIVITY_INQUIRY,
         user_input=user_input,
@@ -278,8 +351,7 @@ def _handle_activity_inquiry(user_input: str, trip_data: dict, tool_results: dic
     )
     
     try:
-        response = llm.invoke(prompt)
-        return str(getattr(response, 'content', response))
+        return cached_invoke(PromptType.ACTIVITY_INQUIRY, prompt)
     except Exception:
         # Fallback to basic response
         return f"Here are the activities for your {destination} trip: {activities_data}"
@@ -294,11 +366,10 @@ def _handle_nearby_inquiry(user_input: str, trip_data: dict, tool_results: dict)
     if not nearby_data:
         return f"I don't have nearby places information for {destination} from our previous planning. Would you like me to find nearby attractions and points of interest?"
     
-    if 'error' in str(nearby_data).lower() or 'not found' in str(nearby_data).lower():
+    if _is_tool_error(nearby_data, _NEARBY_ERROR_RE):
         return f"I had trouble finding nearby places for {destination}: {nearby_data}. Would you like me to search again?"
     
     # Use LLM to generate natural response
-    llm = get_llm()
     prompt = format_prompt(
         PromptType.NEARBY_INQUIRY,
         user_input=user_input,
@@ -307,8 +378,7 @@ def _handle_nearby_inquiry(user_input: str, trip_data: dict, tool_results: dict)
     )
     
     try:
-        response = llm.invoke(prompt)
-        return str(getattr(response, 'content', response))
+        return cached_invoke(PromptType.NEARBY_INQUIRY, prompt)
     except Exception:
         # Fallback to basic response
         return f"Here are nearby places around {destination}: {nearby_data}"
@@ -326,7 +396,6 @@ def _handle_budget_inquiry(user_input: str, trip_data: dict, tool_results: dict)
         return f"I don't have budget information for your {destination} trip from our previous planning. Would you like me to create a budget estimate for you?"
     
     # Use LLM to generate natural response
-    llm = get_llm()
     prompt = format_prompt(
         PromptType.BUDGET_INQUIRY,
         user_input=user_input,
@@ -337,8 +406,7 @@ def _handle_budget_inquiry(user_input: str, trip_data: dict, tool_results: dict)
     )
     
     try:
-        response = llm.invoke(prompt)
-        return str(getattr(response, 'content', response))
+        return cached_invoke(PromptType.BUDGET_INQUIRY, prompt)
     except Exception:
         # Fallback to basic response
         return f"Here's your {destination} trip budget: {budget_data}"
@@ -352,8 +420,13 @@ def _handle_general_trip_inquiry(user_input: str, trip_data: dict, tool_results:
     if not destination:
         return "I don't have information about a previous trip. Would you like to start planning a new trip?"
     
-    # Use LLM to generate natural response about the trip
-    llm = get_llm()
+    # Check which tool results we have once; both the prompt and the fallback use it
+    available = [section for section in _TRIP_INFO_SECTIONS if tool_results.get(section[0])]
+    flights = tool_results.get('flights')
+    info_lines = ''.join(
+        f"- {label}: {len(flights) if key == 'flights' and isinstance(flights, list) else 'Available'}\n"
+        for key, label, _ in available
+    )
     
     # Prepare trip summary
     trip_summary = f"""
@@ -364,18 +437,7 @@ Start Date: {trip_data.get('start_date', 'Not specified')}
 Departure City: {trip_data.get('user_city', 'Not specified')}
 
 Available Information:
-"""
-    
-    if tool_results.get('flights'):
-        trip_summary += f"- Flight options: {len(tool_results['flights']) if isinstance(tool_results['flights'], list) else 'Available'}\n"
-    if tool_results.get('weather'):
-        trip_summary += "- Weather forecast: Available\n"
-    if tool_results.get('activities'):
-        trip_summary += "- Activity suggestions: Available\n"
-    if tool_results.get('nearby'):
-        trip_summary += "- Nearby places: Available\n"
-    if tool_results.get('budget'):
-        trip_summary += "- Budget breakdown: Available\n"
+{info_lines}"""
     
     prompt = format_prompt(
         PromptType.GENERAL_TRIP_INQUIRY,
@@ -384,21 +446,10 @@ Available Information:
     )
     
     try:
-        response = llm.invoke(prompt)
-        return str(getattr(response, 'content', response))
+        return cached_invoke(PromptType.GENERAL_TRIP_INQUIRY, prompt)
     except Exception:
         # Fallback to basic response
-        available_info = []
-        if tool_results.get('flights'):
-            available_info.append("flight options")
-        if tool_results.get('weather'):
-            available_info.append("weather forecast")
-        if tool_results.get('activities'):
-            available_info.append("activity suggestions")
-        if tool_results.get('nearby'):
-            available_info.append("nearby places")
-        if tool_results.get('budget'):
-            available_info.append("budget breakdown")
+        available_info = [phrase for _, _, phrase in available]
         
         if available_info:
             return f"I have {', '.join(available_info)} for your {destination} trip. What would you like to know more about?"
@@ -430,9 +481,6 @@ def _handle_flight_inquiry(user_input: str, context: Dict[str, Any]) -> str:
     if not isinstance(flights_data, list) or not flights_data:
         return f"I couldn't find flight options for your {destination} trip from {user_city}. This might be because {destination} doesn't have a direct airport or the route needs connecting flights."
     
-    # Use LLM to generate natural response about flights
-    llm = get_llm()
-    
     # Prepare flight summary
     flight_summary = f"""
 Route: {user_city} to {destination}
@@ -457,34 +505,37 @@ Option {i}: {flight.get('airline', 'Unknown')}
     )
     
     try:
-        response = llm.invoke(prompt)
-        return str(getattr(response, 'content', response))
+        return cached_invoke(PromptType.FLIGHT_INQUIRY, prompt)
     except Exception:
-        # Fallback to structured response
-        cheapest_flight = min(flights_data, key=lambda x: x.get('price', float('inf')))
+        # Fallback to structured response; the flight tool returns results sorted cheapest first
+        cheapest_flight = flights_data[0]
         return f"I found {len(flights_data)} flight options for your {destination} trip from {user_city}. The cheapest option is {cheapest_flight.get('airline', 'N/A')} at ₹{cheapest_flight.get('price_in_inr', 'N/A')} INR. Would you like more details about the flight options?"
 
 def _extract_planning_details(user_input: str, context: Dict[str, Any]) -> Dict[str, Any]:
-    """Extract trip details using intelligent LLM-based extraction"""
-    llm = get_llm(temperature=0.2)
-    
+    """
+    Extract trip details using intelligent LLM-based extraction
+    Completions are cached on the full prompt, so a restated message with the same known
+    slots and recent chat skips both the primary and the fallback LLM call
+    """
     # Get conversation context to understand what they might be referring to
     chat_context = context.get('_chat_context', '')
     
+    # Only the trip slots matter for extraction; the full context also carries tool results
+    # and the previous itinerary, which would dominate the prompt's token count
+    known_details = {key: context[key] for key in _TRIP_SLOT_KEYS if context.get(key)}
+    
     prompt = format_prompt(
         PromptType.PLANNING_DETAILS_EXTRACTION,
         user_input=user_input,
         chat_context=chat_context,
-        context=context
+        context=known_details
     )
     
     try:
-        response = llm.invoke(prompt).content.strip()
-        json_match = search(r'\{.*\}', response, DOTALL)
-
-        if json_match:
-            extracted = loads(json_match.group())
+        response = cached_invoke(PromptType.PLANNING_DETAILS_EXTRACTION, prompt, temperature=0.2).strip()
+        extracted = extract_json(response)
 
+        if extracted is not None:
             # Only return valid extractions
             valid_data = {}
 
@@ -501,16 +552,82 @@ def _extract_planning_details(user_input: str, context: Dict[str, Any]) -> Dict[
                 user_input=user_input
             )
             
-            fallback_response = llm.invoke(prompt).content.strip()
-            json_match = search(r'\{.*\}', fallback_response, DOTALL)
+            fallback_response = cached_invoke(PromptType.FALLBACK_DETAIL_EXTRACTION, prompt, temperature=0.2).strip()
+            fallback_details = extract_json(fallback_response)
 
-            if json_match:
-                return loads(json_match.group())
+            if fallback_details is not None:
+                return fallback_details
         except Exception:
             pass
     
     return {}
 
+def _extract_semantic_context(recent_conversation: str, user_input: str) -> Dict[str, Any] | None:
+    """
+    Extract mentioned places, regions and time references from the messages added since the
+    last turn, and whether the latest message asks for more suggestions, in a single LLM call
+    """
+    llm = get_llm(temperature=0.3)
+    
+    prompt = format_prompt(
+        PromptType.SEMANTIC_CONTEXT_EXTRACTION,
+        recent_conversation=recent_conversation,
+        user_input=user_input
+    )
+    
+    context_response = llm.invoke(prompt).content.strip()
+    return extract_json(context_response)
+
+
+def _has_followup_keyword(user_input: str) -> bool:
+    """Keyword fallback for follow-up detection when the semantic extraction is unavailable"""
+    return not _FOLLOWUP_KEYWORDS.isdisjoint(_WORD_RE.findall(user_input.lower()))
+
+
+def _messages_since_last_analysis(recent_window: List[Dict[str, Any]], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Messages added since the last context extraction, found by the user message it ended on.
+    Returns the whole window when that message has scrolled out of it (or on a new thread).
+    """
+    marker = context.get('_context_analyzed_upto')
+    if marker is not None:
+        # The newest entry is the current message, so the marker can only be before it
+        for i in range(len(recent_window) - 2, -1, -1):
+            msg = recent_window[i]
+            if msg.get('role') == 'user' and msg.get('content') == marker:
+                return recent_window[i + 1:]
+    return recent_window
+
+
+def _merge_recent(new_items: List[Any], carried: List[Any]) -> List[str]:
+    """Newest-first union of extracted items, de-duplicated case-insensitively and capped"""
+    merged = []
+    seen = set()
+    for item in (*new_items, *carried):
+        text = str(item).strip()
+        if text and text.lower() not in seen:
+            seen.add(text.lower())
+            merged.append(text)
+    return merged[:_MAX_CARRIED_CONTEXT_ITEMS]
+
+
+def _build_followup_context(context: Dict[str, Any]) -> str | None:
+    """Summarize the geographic and time context a follow-up request should stay within"""
+    geo_context = context.get('_geographic_context', [])
+    geo_constraints = context.get('_geographic_constraints', [])
+    time_context = context.get('_temporal_context', [])
+    
+    follow_up_parts = []
+    if geo_constraints:
+        follow_up_parts.append(f"Geographic constraint: {', '.join(geo_constraints[:2])}")
+    elif geo_context:
+        follow_up_parts.append(f"Previous context: {', '.join(geo_context[:3])}")
+    if time_context:
+        follow_up_parts.append(f"Time context: {', '.join(time_context[:2])}")
+    
+    return ' '.join(follow_up_parts) if follow_up_parts else None
+
+
 def conversation_agent(state: ConversationAgentState):
     """Modern, intelligent conversation agent that handles exploration and planning naturally"""
     
@@ -518,8 +635,37 @@ def conversation_agent(state: ConversationAgentState):
     chat_history = state.get('chat_history', []) or []
     context = state.get('context', {}) or {}
     
+    # Recent conversation used for the chat context
+    recent_window = [msg for msg in chat_history[-6:] if isinstance(msg, dict)]
+    recent_msgs = [msg.get('content', '')[:200] for msg in recent_window]
+    
+    # Mentions and constraints are carried forward in the context, so only the messages added
+    # since the last turn (our previous reply and the new user message) need analyzing
+    new_msgs = _messages_since_last_analysis(recent_window, context)
+    new_conversation = ' '.join(msg.get('content', '')[:200] for msg in new_msgs)
+    
+    # Skip the extraction only when the new messages are nothing but greetings and our built-in
+    # replies; the user's own messages (including the first one) can already name places
+    has_extractable_content = any(
+        not (content in _CANNED_RESPONSES or is_smalltalk(content))
+        for content in (str(msg.get('content', '')) for msg in new_msgs) if content.strip()
+    )
+    
+    # Safety screening and the semantic preprocessing call (context + follow-up detection) are
+    # independent LLM round-trips, so run them concurrently. Preprocessing is discarded for unsafe input.
+    safety_future = _POOL.submit(screen_user_input_safety, user_input)
+    context_future = None
+    if has_extractable_content:
+        context_future = _POOL.submit(_extract_semantic_context, new_conversation, user_input)
+    
+    # Without an active destination the planning-context check can't apply, so the intent
+    # classification will be needed: start it now alongside the other preprocessing calls
+    intent_future = None
+    if not context.get('destination'):
+        intent_future = _POOL.submit(_classify_user_intent, user_input, chat_history, context)
+    
     # SAFETY CHECK: Screen user input first
-    safety_check = screen_user_input_safety(user_input)
+    safety_check = safety_future.result()
 
     if not safety_check.get('is_safe', True):
         concern_type = safety_check.get('concern_type', 'unknown')
@@ -541,84 +687,38 @@ def conversation_agent(state: ConversationAgentState):
     # Continue with normal conversation processing...
     
     # Enhanced LLM-based context extraction for better understanding
-    llm = get_llm(temperature=0.3)
-    
-    # Extract context from recent conversation using LLM
-    recent_msgs = [msg.get('content', '')[:200] for msg in chat_history[-6:] if isinstance(msg, dict)]
-    recent_conversation = ' '.join(recent_msgs)
-    
-    if recent_conversation.strip():
-        prompt = format_prompt(
-            PromptType.SEMANTIC_CONTEXT_EXTRACTION,
-            recent_conversation=recent_conversation
-        )
-        
+    extracted_context = None
+    if context_future is None:
+        # Nothing new worth analyzing; move the marker past it
+        context['_context_analyzed_upto'] = user_input
+    else:
         try:
-            context_response = llm.invoke(prompt).content.strip()
-            json_match = search(r'\{.*\}', context_response, DOTALL)
-
-            if json_match:
-                extracted_context = loads(json_match.group())
-                context['_recent_mentions'] = extracted_context.get('recent_mentions', [])
-                context['_geographic_context'] = extracted_context.get('geographic_context', [])
-                context['_temporal_context'] = extracted_context.get('temporal_context', [])
-                context['_geographic_constraints'] = extracted_context.get('geographic_constraints', [])
-        except Exception as e:
-            # Fallback to simple extraction
-            context['_recent_mentions'] = []
-            context['_geographic_context'] = []
-            context['_temporal_context'] = []
-            context['_geographic_constraints'] = []
+            extracted_context = context_future.result()
+
+            if extracted_context is not None:
+                for field, context_key in _CARRIED_CONTEXT_KEYS:
+                    context[context_key] = _merge_recent(extracted_context.get(field) or [], context.get(context_key, []))
+                context['_context_analyzed_upto'] = user_input
+        except Exception:
+            # Keep what earlier turns extracted; the marker isn't moved, so these messages are retried next turn
+            pass
     
     # Enhanced chat context with geographic and temporal awareness
     context['_chat_context'] = ' '.join(recent_msgs[-3:])
     
     # Add specific context for follow-up requests using semantic understanding
-    llm = get_llm(temperature=0.3)
-    
-    # Check if this is a follow-up request semantically
-    prompt = format_prompt(
-        PromptType.SEMANTIC_FOLLOWUP_DETECTION,
-        user_input=user_input
-    )
-    
     try:
-        is_followup = llm.invoke(prompt).content.strip().lower() == 'yes'
-        context['_is_followup_request'] = is_followup
-        if is_followup:
-            geo_context = context.get('_geographic_context', [])
-            geo_constraints = context.get('_geographic_constraints', [])
-            time_context = context.get('_temporal_context', [])
-            
-            follow_up_parts = []
-            if geo_constraints:
-                follow_up_parts.append(f"Geographic constraint: {', '.join(geo_constraints[:2])}")
-            elif geo_context:
-                follow_up_parts.append(f"Previous context: {', '.join(geo_context[:3])}")
-            if time_context:
-                follow_up_parts.append(f"Time context: {', '.join(time_context[:2])}")
-            
-            if follow_up_parts:
-                context['_follow_up_context'] = ' '.join(follow_up_parts)
+        # Raises when the extraction was skipped or failed, falling back to the keyword check
+        is_followup = bool(extracted_context['is_followup'])
     except Exception:
         # Fallback to simple keyword check
-        is_followup = any(word in user_input.lower() for word in ['more', 'few more', 'other', 'additional', 'alternative'])
-        context['_is_followup_request'] = is_followup
-        if is_followup:
-            geo_context = context.get('_geographic_context', [])
-            geo_constraints = context.get('_geographic_constraints', [])
-            time_context = context.get('_temporal_context', [])
-            
-            follow_up_parts = []
-            if geo_constraints:
-                follow_up_parts.append(f"Geographic constraint: {', '.join(geo_constraints[:2])}")
-            elif geo_context:
-                follow_up_parts.append(f"Previous context: {', '.join(geo_context[:3])}")
-            if time_context:
-                follow_up_parts.append(f"Time context: {', '.join(time_context[:2])}")
-            
-            if follow_up_parts:
-                context['_follow_up_context'] = ' '.join(follow_up_parts)
+        is_followup = _has_followup_keyword(user_input)
+    
+    context['_is_followup_request'] = is_followup
+    if is_followup:
+        follow_up_context = _build_followup_context(context)
+        if follow_up_context:
+            context['_follow_up_context'] = follow_up_context
     
     # Enhanced context-aware intent classification
     # Check if user has active planning context first, before relying on chat history
@@ -633,9 +733,15 @@ def conversation_agent(state: ConversationAgentState):
         intent = 'plan'
     else:
         # Use normal LLM-based intent classification for new conversations
-        intent_data = _classify_user_intent(user_input, chat_history)
+        if intent_future is not None:
+            intent_data = intent_future.result()
+        else:
+            intent_data = _classify_user_intent(user_input, chat_history, context)
         intent = intent_data.get('intent', 'chat')
     
+    # Lets the next turn's "more options" fast path know what the options were
+    context['_suggested_destinations'] = intent == 'explore' and _explores_destinations(intent_data)
+    
     # Handle different intents
     response = ""
     if intent == 'explore':
@@ -643,8 +749,14 @@ def conversation_agent(state: ConversationAgentState):
     elif intent == 'chat':
         response = _handle_general_chat(user_input, context)
     elif intent == 'plan':
-        # Extract planning details
-        extracted = _extract_planning_details(user_input, context)
+        # Reuse details returned by the classifier; fall back to a separate extraction call when
+        # it returned none, or only empty values
+        details = intent_data.get('details')
+        extracted = {}
+        if isinstance(details, dict):
+            extracted = {key: value for key, value in details.items() if value and str(value).strip()}
+        if not extracted:
+            extracted = _extract_planning_details(user_input, context)
         
         # Update context with extracted details
         for key, value in extracted.items():
@@ -684,7 +796,7 @@ def conversation_agent(state: ConversationAgentState):
         
         if not has_destination:
             # Ask them to specify destination
-            response = "Which destination would you like me to plan for? I can help you choose from the places we discussed or somewhere completely new!"
+            response = _ASK_DESTINATION_RESPONSE
         else:
             # Ready to hand off to trip planner
             return {
@@ -697,15 +809,16 @@ def conversation_agent(state: ConversationAgentState):
     
     # Fallback
     if not response:
-        response = "I'm here to help you plan amazing trips! What kind of adventure are you thinking about?"
-    
-    # SAFETY CHECK: Validate response before returning
-    response_safety = validate_response_safety(response, user_input)
+        response = _DEFAULT_RESPONSE
     
-    if not response_safety.get('is_safe', True):
-        improved_response = response_safety.get('improved_response', '')
-        if improved_response and improved_response.strip():
-            response = improved_response
+    # SAFETY CHECK: Validate generated responses before returning
+    if response not in _CANNED_RESPONSES:
+        response_safety = validate_response_safety(response, user_input)
+        
+        if not response_safety.get('is_safe', True):
+            improved_response = response_safety.get('improved_response', '')
+            if improved_response and improved_response.strip():
+                response = improved_response
     
     return {
         'response': response,
@@ -715,6 +828,35 @@ def conversation_agent(state: ConversationAgentState):
         'safety_validated': True
     }
 
+_MAX_CHECKPOINT_THREADS = 256
+
+
+class _BoundedMemorySaver(MemorySaver):
+    """MemorySaver that only keeps checkpoints for the most recently used threads"""
+
+    def __init__(self, max_threads: int):
+        super().__init__()
+        self._max_threads = max_threads
+        self._recent_threads = OrderedDict()
+        self._threads_lock = Lock()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config['configurable']['thread_id']
+        
+        with self._threads_lock:
+            self._recent_threads[thread_id] = None
+            self._recent_threads.move_to_end(thread_id)
+            evicted = []
+            while len(self._recent_threads) > self._max_threads:
+                evicted.append(self._recent_threads.popitem(last=False)[0])
+        
+        # Drop every checkpoint of threads that fell out of the window
+        for old_thread_id in evicted:
+            self.delete_thread(old_thread_id)
+        
+        return super().put(config, checkpoint, metadata, new_versions)
+
+
 def build_conversation_graph():
     """Build the conversation graph with intelligent routing"""
     graph = StateGraph(ConversationAgentState)
@@ -744,19 +886,25 @@ def build_conversation_graph():
     graph.add_edge('trip_planner', END)
     graph.set_entry_point('conversation')
     
-    memory = MemorySaver()
+    memory = _BoundedMemorySaver(max_threads=_MAX_CHECKPOINT_THREADS)
     return graph.compile(checkpointer=memory)
 
 # Cache the graph
 _GRAPH_CACHE = None
+_GRAPH_LOCK = Lock()
 
-def run_conversation_graph(user_input, chat_history, context=None):
-    """Run the conversation with the new intelligent routing"""
+def get_graph():
+    """Return the compiled conversation graph, building it once even under concurrent first calls"""
     global _GRAPH_CACHE
     
     if _GRAPH_CACHE is None:
-        _GRAPH_CACHE = build_conversation_graph()
-    
+        with _GRAPH_LOCK:
+            if _GRAPH_CACHE is None:
+                _GRAPH_CACHE = build_conversation_graph()
+    return _GRAPH_CACHE
+
+def run_conversation_graph(user_input, chat_history, context=None):
+    """Run the conversation with the new intelligent routing"""
     context = context or {}
     state: ConversationAgentState = {
         'user_input': user_input,
@@ -771,5 +919,9 @@ def run_conversation_graph(user_input, chat_history, context=None):
         context['_thread_id'] = thread_id
         state['context'] = context
     
-    result = _GRAPH_CACHE.invoke(state, config={'configurable': {'thread_id': thread_id}})
+    result = get_graph().invoke(state, config={'configurable': {'thread_id': thread_id}})
     return result
+
+# Compile at import so the first user turn doesn't pay for graph construction
+if WARM_GRAPH:
+    get_graph()
@@ -1,19 +1,88 @@
+from atexit import register
 from classTypes.class_types import TripPlannerState
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait
 from prompts import format_prompt, PromptType
+from re import compile, IGNORECASE
+from time import time
 from tools.activity import get_activity_tool
 from tools.flight import get_flight_tool
 from tools.map import get_map_tool
 from tools.weather import get_weather_tool
 from tools.assembler import get_assembler_tool
 from tools.budget import get_budget_tool
-from utils.set_llm import get_llm
+from utils.llm_cache import cached_invoke
+from utils.ttl_cache import TTLCache
 from utils.safety import (
     validate_response_safety, 
     is_sensitive_destination
 )
 
 
+# Persistent pool for the planning tool fan-out, so each plan doesn't pay thread start-up/teardown
+_TOOL_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="trip-tools")
+register(_TOOL_POOL.shutdown)
+
+# Speculative prefetches get their own workers, so they never queue ahead of a plan's
+# tools and eat into its batch deadline
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="trip-prefetch")
+register(_PREFETCH_POOL.shutdown)
+
+# Overall deadline for the planning fan-out; tools still running after it are left out of the plan
+_TOOL_BATCH_TIMEOUT = 10  # seconds
+_TOOL_LABELS = {
+    'activities': "🎯 **Activities**",
+    'weather': "🌤️ **Weather**",
+    'flights': "✈️ **Flight Search**",
+    'nearby': "📍 **Nearby Places**",
+    'budget': "💰 **Budget**"
+}
+
+# Weather tool failure messages, matched in one case-insensitive pass
+_WEATHER_FAILURE_RE = compile(r'could not find|error', IGNORECASE)
+
+# Phrases asking for the plan to be rebuilt even though the trip details are unchanged
+_REFRESH_RE = compile(r'\b(?:refresh|again|re-?plan|redo)\b', IGNORECASE)
+
+# A replayed plan carries fares and a forecast, so it can't outlive the shortest tool cache TTL (flights)
+_PLAN_REPLAY_TTL = 15 * 60  # seconds
+
+# Destinations whose destination-only lookups were recently started, so follow-up
+# questions don't launch duplicates while the first ones are still in flight
+_PREFETCHED_DESTINATIONS = TTLCache(maxsize=256, ttl=10 * 60)
+
+
+def _prefetch_destination_tools(destination: str) -> None:
+    """
+    Warm the activity and nearby-place caches while we are still asking for trip details.
+    Both depend only on the destination, so the final fan-out finds them ready.
+    """
+    key = destination.strip().lower()
+    if _PREFETCHED_DESTINATIONS.get(key):
+        return
+    _PREFETCHED_DESTINATIONS.set(key, True)
+    _PREFETCH_POOL.submit(get_activity_tool().func, destination)
+    _PREFETCH_POOL.submit(get_map_tool().func, destination)
+
+
+def _destination_suggestion(prompt_type: PromptType, destination: str) -> str:
+    """Cached destination-specific suggestion (duration or best time to visit)"""
+    prompt = format_prompt(prompt_type, destination=destination)
+    return cached_invoke(prompt_type, prompt).strip()
+
+
+def _ask_with_suggestion(ctx: dict, prompt_type: PromptType, destination: str, question: str, fallback: str) -> dict:
+    """Ask for a missing trip detail, leading with a suggestion when the LLM can provide one"""
+    try:
+        response = question.format(suggestion=_destination_suggestion(prompt_type, destination))
+    except Exception:
+        response = fallback
+    
+    return {
+        "response": response,
+        "missing_info": True,
+        "context": ctx
+    }
+
 def trip_planner_node(state: TripPlannerState):
     """Simplified trip planning node - only runs when user is ready to plan"""
     ctx = state.get('context', {}) or {}
@@ -31,6 +100,11 @@ def trip_planner_node(state: TripPlannerState):
             "context": ctx
         }
     
+    duration = ctx.get('duration_days')
+    travelers = ctx.get('number_of_travelers')
+    if not (user_city and travelers and duration and start_date):
+        _prefetch_destination_tools(destination)
+    
     if not user_city:
         return {
             "response": f"Great choice on {destination}! Which city will you be departing from?",
@@ -39,7 +113,6 @@ def trip_planner_node(state: TripPlannerState):
         }
     
     # Ask for missing details with intelligent defaults
-    travelers = ctx.get('number_of_travelers')
     if not travelers:
         return {
             "response": "How many travelers will be going on this trip?",
@@ -47,83 +120,73 @@ def trip_planner_node(state: TripPlannerState):
             "context": ctx
         }
     
-    duration = ctx.get('duration_days')
     if not duration:
+        # The date question comes next, so warm its suggestion while this one is generated
+        if not start_date:
+            _PREFETCH_POOL.submit(_destination_suggestion, PromptType.BEST_TIME_SUGGESTION, destination)
+        
         # Intelligent duration suggestion based on destination
-        llm = get_llm()
-        prompt = format_prompt(
-            PromptType.DURATION_SUGGESTION,
-            destination=destination
+        return _ask_with_suggestion(
+            ctx, PromptType.DURATION_SUGGESTION, destination,
+            "{suggestion}. How many days would you prefer?",
+            "How many days would you like this trip to last?"
         )
-        
-        try:
-            suggestion = llm.invoke(prompt).content.strip()
-            return {
-                "response": f"{suggestion}. How many days would you prefer?",
-                "missing_info": True,
-                "context": ctx
-            }
-        except Exception:
-            return {
-                "response": "How many days would you like this trip to last?",
-                "missing_info": True,
-                "context": ctx
-            }
     
     # NEW: Ask for travel date if missing
     if not start_date:
-        # Intelligent date suggestion based on destination
-        llm = get_llm()
-        prompt = format_prompt(
-            PromptType.BEST_TIME_SUGGESTION,
-            destination=destination
+        # Intelligent date suggestion based on destination (usually prefetched on the previous turn)
+        return _ask_with_suggestion(
+            ctx, PromptType.BEST_TIME_SUGGESTION, destination,
+            "When would you like to travel? {suggestion}. Please provide your preferred departure date (YYYY-MM-DD format).",
+            "When would you like to travel? Please provide your preferred departure date (YYYY-MM-DD format)."
         )
-        
-        try:
-            suggestion = llm.invoke(prompt).content.strip()
-            return {
-                "response": f"When would you like to travel? {suggestion}. Please provide your preferred departure date (YYYY-MM-DD format).",
-                "missing_info": True,
-                "context": ctx
-            }
-        except Exception:
-            return {
-                "response": "When would you like to travel? Please provide your preferred departure date (YYYY-MM-DD format).",
-                "missing_info": True,
-                "context": ctx
-            }
+    
+    # Replay the last plan when none of its inputs changed, unless the user asked for a fresh one
+    plan_key = '|'.join(str(value) for value in (user_city, destination, start_date, duration, travelers))
+    if ctx.get('_last_plan_key') == plan_key and ctx.get('_last_plan_response') \
+            and time() - ctx.get('_last_plan_time', 0) < _PLAN_REPLAY_TTL \
+            and not _REFRESH_RE.search(state.get('user_input', '')):
+        return {
+            "response": ctx['_last_plan_response'],
+            "missing_info": False,
+            "context": ctx,
+            "planning_stage": "completed",
+            "safety_validated": True
+        }
     
     # Now we have enough info to plan - run tools in parallel for better performance
     try:
         results = {}
         
+        # Tool factories are cached singletons; resolve them once rather than inside each task
+        activity_tool = get_activity_tool()
+        weather_tool = get_weather_tool()
+        flight_tool = get_flight_tool()
+        map_tool = get_map_tool()
+        budget_tool = get_budget_tool()
+        
         def run_activity_tool():
             if destination:
-                activity_tool = get_activity_tool()
                 return ('activities', activity_tool.func(destination))
             return ('activities', None)
         
         def run_weather_tool():
             if destination and start_date:
-                weather_tool = get_weather_tool()
                 return ('weather', weather_tool.func(destination, start_date))
             return ('weather', None)
         
         def run_flight_tool():
             if user_city and destination and start_date:
-                flight_tool = get_flight_tool()
                 return ('flights', flight_tool.func(user_city, destination, start_date, travelers))
             return ('flights', None)
         
         def run_map_tool():
             if destination:
-                map_tool = get_map_tool()
                 return ('nearby', map_tool.func(destination))
             return ('nearby', None)
         
         def run_budget_tool():
             if destination and duration:
-                budget_tool = get_budget_tool()
                 budget_input = {
                     'destination': destination,
                     'nights': duration - 1,
@@ -141,44 +204,44 @@ def trip_planner_node(state: TripPlannerState):
                 return ('budget', budget_tool.func(budget_input))
             return ('budget', None)
         
-        # Execute tools in parallel for independent operations        
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            # Submit all independent tool calls
-            future_to_tool = {
-                executor.submit(run_activity_tool): 'activities',
-                executor.submit(run_weather_tool): 'weather', 
-                executor.submit(run_map_tool): 'nearby'
-            }
-            
-            # Flight and budget tools might depend on each other, but can run independently of others
-            if user_city and destination and start_date:
-                future_to_tool[executor.submit(run_flight_tool)] = 'flights'
-            
-            if destination and duration:
-                future_to_tool[executor.submit(run_budget_tool)] = 'budget'
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_tool):
-                tool_name = future_to_tool[future]
-                try:
-                    key, result = future.result(timeout=15)  # 15s timeout per tool
-                    if result:
-                        results[key] = result
-                except Exception:
-                    # Continue with other tools even if one fails
-                    pass
+        # Execute tools in parallel for independent operations
+        # Submit all independent tool calls
+        future_to_tool = {
+            _TOOL_POOL.submit(run_activity_tool): 'activities',
+            _TOOL_POOL.submit(run_weather_tool): 'weather', 
+            _TOOL_POOL.submit(run_map_tool): 'nearby'
+        }
         
-        # Extract flight cost and currency for budget calculations
-        if 'flights' in results:
+        # Flight and budget tools might depend on each other, but can run independently of others
+        if user_city and destination and start_date:
+            future_to_tool[_TOOL_POOL.submit(run_flight_tool)] = 'flights'
+        
+        if destination and duration:
+            future_to_tool[_TOOL_POOL.submit(run_budget_tool)] = 'budget'
+        
+        # Wait once for the whole batch, so one slow tool can't hold back a plan the others completed
+        done, pending = wait(future_to_tool, timeout=_TOOL_BATCH_TIMEOUT)
+        for future in done:
             try:
-                flights_data = results['flights']
-                if isinstance(flights_data, list) and flights_data and 'price' in flights_data[0]:
-                    # Get the cheapest flight for budget calculation
-                    cheapest_flight = min(flights_data, key=lambda x: x.get('price', float('inf')))
-                    ctx['flight_cost'] = cheapest_flight.get('price')
-                    ctx['flight_currency'] = cheapest_flight.get('currency', 'USD')
+                key, result = future.result()
+                if result:
+                    results[key] = result
             except Exception:
+                # Continue with other tools even if one fails
                 pass
+        
+        # Drop tools still queued; ones already running finish in the background and fill their caches
+        for future in pending:
+            future.cancel()
+        timed_out = sorted(future_to_tool[future] for future in pending)
+        
+        # Extract flight cost and currency for budget calculations
+        flights_data = results.get('flights')
+        if isinstance(flights_data, list) and flights_data and 'price' in flights_data[0]:
+            # The flight tool returns offers sorted by price, so the first one is the cheapest
+            cheapest_flight = flights_data[0]
+            ctx['flight_cost'] = cheapest_flight['price']
+            ctx['flight_currency'] = cheapest_flight.get('currency', 'USD')
 
         # Store all tool results in context for later reference
         ctx['tool_results'] = results
@@ -192,7 +255,10 @@ def trip_planner_node(state: TripPlannerState):
         }
         
         # Check for critical failures and inform user upfront
-        critical_issues = []
+        critical_issues = [
+            f"{_TOOL_LABELS[tool_name]}: This took too long to respond, so it's left out of this plan"
+            for tool_name in timed_out
+        ]
         
         # Check flight search failures
         if 'flights' in results:
@@ -203,7 +269,7 @@ def trip_planner_node(state: TripPlannerState):
         # Check weather failures 
         if 'weather' in results:
             weather_data = results['weather']
-            if isinstance(weather_data, str) and ('could not find' in weather_data.lower() or 'error' in weather_data.lower()):
+            if isinstance(weather_data, str) and _WEATHER_FAILURE_RE.search(weather_data):
                 critical_issues.append(f"🌤️ **Weather**: I couldn't get weather data for {destination}")
         
         # Assemble everything into a coherent itinerary
@@ -241,6 +307,12 @@ def trip_planner_node(state: TripPlannerState):
             safety_disclaimer = f"\n\n🛡️ **Important Safety Notice**: {destination} may require special precautions. Please check current travel advisories, local laws, and safety conditions before traveling. Consider consulting your country's travel advisory services."
             final_response += safety_disclaimer
 
+        # Partial plans are not replayed, so the next request retries the tools that timed out
+        if not timed_out:
+            ctx['_last_plan_key'] = plan_key
+            ctx['_last_plan_response'] = final_response
+            ctx['_last_plan_time'] = time()
+
         return {
             "response": final_response,
             "missing_info": False,
@@ -39,7 +39,6 @@ class PromptType(Enum):
     SEMANTIC_INTENT_FALLBACK = "semantic_intent_fallback"
     SEMANTIC_QUERY_CLASSIFICATION = "semantic_query_classification"
     SEMANTIC_CONTEXT_EXTRACTION = "semantic_context_extraction"
-    SEMANTIC_FOLLOWUP_DETECTION = "semantic_followup_detection"
     FALLBACK_DETAIL_EXTRACTION = "fallback_detail_extraction"
     NEW_TRIP_DETECTION = "new_trip_detection"
     NON_PLANNING_DETECTION = "non_planning_detection"
@@ -67,12 +66,7 @@ class PromptRegistry:
             
         # Conversation Agent Prompts
         cls._templates[PromptType.INTENT_CLASSIFICATION] = PromptTemplate(
-            template="""You are a travel planning assistant. Analyze the user's intent and classify their request:
-
-Recent conversation:
-{recent_context}
-
-Current user message: "{user_input}"
+            template="""You are a travel planning assistant. Analyze the user's intent and classify their request.
 
 Classification rules:
 - "explore": User wants travel destination suggestions, browsing travel options, or asking "where should I go"
@@ -82,7 +76,21 @@ Classification rules:
 Important: Questions like "what can you do", "help me", "can you do anything else" are CHAT, not explore.
 Only use "explore" when they specifically want travel destination suggestions.
 
-Return JSON with: {{"intent": "explore|plan|chat", "exploring": "string or null", "planning_destination": "string or null", "ready_to_plan": true/false}}""",
+When the intent is "plan", also fill "details" with any trip details EXPLICITLY mentioned or clearly implied (omit keys that are not stated):
+- destination: specific place name
+- origin: departure city
+- date: travel date (YYYY-MM-DD if possible)
+- duration: number of days
+- travelers: number of people
+- budget: budget amount
+For "explore" and "chat", set "details" to null.
+
+Return JSON with: {{"intent": "explore|plan|chat", "exploring": "string or null", "planning_destination": "string or null", "ready_to_plan": true/false, "details": {{...}} or null}}
+
+Recent conversation:
+{recent_context}
+Current user message: "{user_input}"
+""",
             input_variables=["recent_context", "user_input"]
         )
         
@@ -367,29 +375,21 @@ Respond with just the category name.""",
             template="""Analyze this conversation for travel context:
 "{recent_conversation}"
 
+The user's latest message is: "{user_input}"
+
 Extract specific details and return JSON:
 {{
     "recent_mentions": ["specific place names, countries, regions mentioned"],
     "geographic_context": ["countries/regions discussed like 'India', 'Europe', 'Asia'"],
     "temporal_context": ["time/season references like 'October', 'winter', 'spring'"],
-    "geographic_constraints": ["explicit geographic limits like 'in India', 'places in Europe', etc."]
+    "geographic_constraints": ["explicit geographic limits like 'in India', 'places in Europe', etc."],
+    "is_followup": true/false
 }}
 
 IMPORTANT: Pay special attention to geographic constraints like "places in [country]" or "destinations in [region]".
-Only include actual mentions. Return {{}} if none found.""",
-            input_variables=["recent_conversation"]
-        )
-        
-        cls._templates[PromptType.SEMANTIC_FOLLOWUP_DETECTION] = PromptTemplate(
-            template="""Analyze if this is a follow-up request for more suggestions:
-"{user_input}"
-
-Return only "yes" or "no" based on whether the user is asking for:
-- More options/suggestions
-- Additional alternatives  
-- Different choices
-- Other recommendations""",
-            input_variables=["user_input"]
+Set "is_followup" to true only if the latest message asks for more options/suggestions, additional alternatives, different choices or other recommendations.
+Only include actual mentions; use empty lists when none are found.""",
+            input_variables=["recent_conversation", "user_input"]
         )
         
         cls._templates[PromptType.FALLBACK_DETAIL_EXTRACTION] = PromptTemplate(
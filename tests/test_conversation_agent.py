@@ -0,0 +1,27 @@
+from os import environ
+
+# Don't compile the conversation graph just to test helpers
+environ.setdefault("WARM_GRAPH", "0")
+
+import pytest
+
+from agents.conversation_agent import _has_followup_keyword
+
+
+@pytest.mark.parametrize("message", [
+    "show me another one",
+    "any other places?",
+    "a few more please",
+    "what else is there?",
+    "got any alternatives",
+])
+def test_followup_keyword_fallback_matches_followups(message):
+    assert _has_followup_keyword(message)
+
+
+@pytest.mark.parametrize("message", [
+    "plan a trip to goa",
+    "what's the weather like there",
+])
+def test_followup_keyword_fallback_ignores_other_messages(message):
+    assert not _has_followup_keyword(message)
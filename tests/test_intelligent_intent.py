@@ -0,0 +1,58 @@
+from json import dumps
+
+import pytest
+
+from utils import intelligent_intent
+from utils.intelligent_intent import IntelligentIntentClassifier
+
+
+class _FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class _FakeLLM:
+    """Stands in for the chat model and counts the classification round-trips"""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return _FakeResponse(dumps(self.result))
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    llm = _FakeLLM({'intent': 'explore', 'exploring': 'destinations', 'planning_destination': None, 'ready_to_plan': False})
+    monkeypatch.setattr(intelligent_intent, 'get_llm', lambda **kwargs: llm)
+    monkeypatch.setattr(intelligent_intent, 'ALLOW_SEMANTIC_CACHE', True)
+    intelligent_intent._intent_cache.clear()
+    intelligent_intent._signature_cache.clear()
+    yield llm
+    intelligent_intent._intent_cache.clear()
+    intelligent_intent._signature_cache.clear()
+
+
+def _ui_history(*messages):
+    """History shaped like the UI sends it: prior turns followed by the current user message"""
+    return [{'role': role, 'content': content} for role, content in messages]
+
+
+def test_reworded_message_hits_signature_cache_with_ui_history(fake_llm):
+    prior = (('user', 'hi'), ('assistant', 'Hello! Where would you like to go?'))
+
+    first = 'suggest some destinations'
+    IntelligentIntentClassifier.classify_intent(first, _ui_history(*prior, ('user', first)))
+
+    reworded = 'destinations suggest please'
+    result = IntelligentIntentClassifier.classify_intent(reworded, _ui_history(*prior, ('user', reworded)))
+
+    assert result['intent'] == 'explore'
+    assert fake_llm.calls == 1
+
+
+def test_prior_history_keeps_history_without_trailing_current_message():
+    history = _ui_history(('user', 'suggest some destinations'), ('assistant', 'Try Goa or Kerala.'))
+    assert intelligent_intent._prior_history('tell me more', history) == history
@@ -1,20 +1,27 @@
 from langchain.tools import Tool
 from utils.set_llm import get_llm
+from utils.ttl_cache import TTLCache
 from functools import lru_cache
 from prompts import format_prompt, PromptType
 
 
-@lru_cache(maxsize=32)
+# Suggestions per normalized destination; failures are not cached so they are retried
+_activity_cache = TTLCache(maxsize=128, ttl=24 * 60 * 60)
+
+
 def suggest_activities(destination: str) -> str:
     """
     Uses the LLM to suggest activities based on the given destination.
-    Results are cached to avoid repeated LLM calls for the same destination.
+    Results are cached for a day to avoid repeated LLM calls for the same destination.
     """
     if not destination or not isinstance(destination, str):
         return "Please provide a valid travel destination as a text description."
 
     # Normalize destination for better cache hits
     destination_normalized = destination.strip().lower().title()
+    cached = _activity_cache.get(destination_normalized)
+    if cached is not None:
+        return cached
     
     llm = get_llm()
     prompt = format_prompt(
@@ -25,11 +32,13 @@ def suggest_activities(destination: str) -> str:
     try:
         res = llm.invoke(prompt)
         content = str(getattr(res, 'content', res))
+        _activity_cache.set(destination_normalized, content)
         return content
     except Exception:
         return "Sorry, I couldn't generate activity suggestions at this time. Please try again."
 
 
+@lru_cache(maxsize=1)
 def get_activity_tool():
     return Tool(
         name="Activity Suggestion Tool",
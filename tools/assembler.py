@@ -1,7 +1,8 @@
+from functools import lru_cache
 from hashlib import md5
 from langchain.tools import Tool
 from prompts import format_prompt, PromptType
-from re import finditer, IGNORECASE
+from re import compile, IGNORECASE
 from tools.currency import convert_amount
 from utils.set_llm import get_llm
 
@@ -25,30 +26,27 @@ def _create_itinerary_cache_key(trip_data: dict) -> str:
 # Simple cache for assembled itineraries
 _itinerary_cache = {}
 
+# USD amounts in a single pass: $500 / $1,200.50, USD 500, 500 USD.
+# Exactly one group matches per hit, so match.lastindex points at the amount.
+_USD_AMOUNT = r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'
+_USD_RE = compile(rf'\${_USD_AMOUNT}|USD\s*{_USD_AMOUNT}|{_USD_AMOUNT}\s*USD', IGNORECASE)
+
 
 def _convert_usd_to_inr_in_text(text: str) -> str:
     """Convert any USD amounts found in text to INR and append the conversion"""
     try:        
         # Find USD amounts in the text (patterns like $500, USD 500, $1,200, etc.)
-        usd_patterns = [
-            r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',  # $500, $1,200, $1,200.50
-            r'USD\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',  # USD 500, USD 1,200
-            r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*USD',  # 500 USD, 1,200 USD
-        ]
-        
         converted_text = text
         conversions_made = []
         
-        for pattern in usd_patterns:
-            matches = finditer(pattern, text, IGNORECASE)
-            for match in matches:
-                amount_str = match.group(1).replace(',', '')  # Remove commas
-                try:
-                    amount = float(amount_str)
-                    inr_amount = convert_amount(amount, 'USD', 'INR')
-                    conversions_made.append(f"${amount_str} USD = ₹{inr_amount} INR")
-                except Exception:
-                    continue
+        for match in _USD_RE.finditer(text):
+            amount_str = match.group(match.lastindex).replace(',', '')  # Remove commas
+            try:
+                amount = float(amount_str)
+                inr_amount = convert_amount(amount, 'USD', 'INR')
+                conversions_made.append(f"${amount_str} USD = ₹{inr_amount} INR")
+            except Exception:
+                continue
         
         # If we made conversions, append them to the text
         if conversions_made:
@@ -119,6 +117,7 @@ def assemble_itinerary(trip_data: dict) -> str:
         return f"Sorry, I couldn't assemble the itinerary at this time. Here's what I have for {destination}: {str(trip_data)[:500]}..."
 
 
+@lru_cache(maxsize=1)
 def get_assembler_tool():
     return Tool(
         name="Itinerary Assembler Tool",
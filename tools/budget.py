@@ -1,7 +1,10 @@
+from functools import lru_cache
 from hashlib import md5
+from json import loads
 from langchain.tools import Tool
 from prompts import format_prompt, PromptType
 from tools.currency import convert_amount
+from utils.config import BUDGET_LLM_MODEL
 from utils.set_llm import get_llm
 
 
@@ -22,6 +25,35 @@ def _create_budget_cache_key(trip_details: dict) -> str:
 _budget_cache = {}
 
 
+def _build_budget_prompt(trip_details: dict) -> str:
+    """Build the budget estimation prompt, converting the flight cost to INR if needed"""
+    flight_cost = trip_details.get('flight_cost')
+    flight_currency = trip_details.get('flight_currency', 'USD')
+    
+    if not flight_cost:
+        flight_line = "Flight cost unknown: exclude from total unless you must estimate (then be conservative)."
+    else:
+        # Convert flight cost to INR if needed
+        if flight_currency.upper() != 'INR':
+            try:
+                flight_cost_inr = convert_amount(float(flight_cost), flight_currency, 'INR')
+                flight_line = f"Flight cost: ₹{flight_cost_inr} INR (converted from {flight_currency} {flight_cost})"
+            except Exception:
+                # Fallback if conversion fails
+                flight_line = f"Flight cost: {flight_currency} {flight_cost} (conversion to INR failed, please estimate)"
+        else:
+            flight_line = f"Flight cost: ₹{flight_cost} INR"
+            
+    return format_prompt(
+        PromptType.BUDGET_ESTIMATION,
+        destination=trip_details['destination'],
+        flight_line=flight_line,
+        nights=trip_details.get('nights', 1),
+        travelers=trip_details.get('travelers', 1),
+        activities=', '.join(trip_details.get('activities', ['general tourism']))
+    )
+
+
 def trip_budget_estimator(trip_details: dict) -> str:
     """
     Estimates a detailed trip budget using the LLM for all categories in a single call.
@@ -33,7 +65,15 @@ def trip_budget_estimator(trip_details: dict) -> str:
       - days (int)
       - travelers (int)
       - flight_currency (str, optional)
+    Agent-style callers may pass the same fields as a JSON string.
     """
+    # Structured input arrives as a JSON string from agents; parse it directly
+    if isinstance(trip_details, str):
+        try:
+            trip_details = loads(trip_details)
+        except ValueError:
+            pass
+
     # Input validation
     if not isinstance(trip_details, dict):
         return "Error: Trip details must be provided as a dictionary."
@@ -47,32 +87,8 @@ def trip_budget_estimator(trip_details: dict) -> str:
     if cache_key in _budget_cache:
         return _budget_cache[cache_key]
     
-    llm = get_llm()
-    flight_cost = trip_details.get('flight_cost')
-    flight_currency = trip_details.get('flight_currency', 'USD')
-    
-    if not flight_cost:
-        flight_line = "Flight cost unknown: exclude from total unless you must estimate (then be conservative)."
-    else:
-        # Convert flight cost to INR if needed
-        if flight_currency.upper() != 'INR':
-            try:
-                flight_cost_inr = convert_amount(float(flight_cost), flight_currency, 'INR')
-                flight_line = f"Flight cost: ₹{flight_cost_inr} INR (converted from {flight_currency} {flight_cost})"
-            except Exception:
-                # Fallback if conversion fails
-                flight_line = f"Flight cost: {flight_currency} {flight_cost} (conversion to INR failed, please estimate)"
-        else:
-            flight_line = f"Flight cost: ₹{flight_cost} INR"
-            
-    prompt = format_prompt(
-        PromptType.BUDGET_ESTIMATION,
-        destination=destination,
-        flight_line=flight_line,
-        nights=trip_details.get('nights', 1),
-        travelers=trip_details.get('travelers', 1),
-        activities=', '.join(trip_details.get('activities', ['general tourism']))
-    )
+    llm = get_llm(model=BUDGET_LLM_MODEL)
+    prompt = _build_budget_prompt(trip_details)
 
     try:
         res = llm.invoke(prompt)
@@ -86,6 +102,7 @@ def trip_budget_estimator(trip_details: dict) -> str:
         return "Sorry, I couldn't generate a budget estimate at this time. Please try again."
 
 
+@lru_cache(maxsize=1)
 def get_budget_tool():
     return Tool(
         name="Trip Budget Estimator",
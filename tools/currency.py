@@ -1,15 +1,13 @@
-from requests import get
+from utils.http import HTTP_SESSION, HTTP_TIMEOUT
 from functools import lru_cache
-from time import time
 from langchain.tools import Tool
+from utils.ttl_cache import TTLCache
 
-# Simple in-memory cache with TTL
-_CACHE = {"rates": None, "base": None, "ts": 0}
-_TTL = 3600  # 1 hour
+# Rate tables per base currency, so every amount and target for a base reuses one fetch
+_RATE_CACHE = TTLCache(maxsize=32, ttl=3600)  # 1 hour
 
 API_URL = "https://api.exchangerate.host/latest"
 
-@lru_cache(maxsize=64)
 def convert_amount(amount: float, from_currency: str, to_currency: str = "INR") -> float:
     from_currency = (from_currency or "USD").upper()
     to_currency = (to_currency or "INR").upper()
@@ -24,18 +22,17 @@ def convert_amount(amount: float, from_currency: str, to_currency: str = "INR")
     return round(amount * rate, 2)
 
 def _get_rates(base: str = "USD"):
-    now = time()
-    if _CACHE["rates"] and _CACHE["base"] == base and now - _CACHE["ts"] < _TTL:
-        return _CACHE["rates"]
+    rates = _RATE_CACHE.get(base)
+    if rates is not None:
+        return rates
     try:
-        resp = get(API_URL, params={"base": base}, timeout=10)
+        resp = HTTP_SESSION.get(API_URL, params={"base": base}, timeout=HTTP_TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
         rates = data.get("rates")
         if rates:
-            _CACHE["rates"] = rates
-            _CACHE["base"] = base
-            _CACHE["ts"] = now
+            # Failed lookups are not cached, so the next conversion retries
+            _RATE_CACHE.set(base, rates)
             return rates
     except Exception:
         return None
@@ -53,6 +50,7 @@ def _convert_wrapper(params: dict) -> str:
     return f"{amount_f} {fc} ≈ {converted} {tc}"
 
 
+@lru_cache(maxsize=1)
 def get_currency_tool():
     return Tool(
         name="Currency Conversion Tool",
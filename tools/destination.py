@@ -31,6 +31,7 @@ def suggest_destinations(preferences: str) -> str:
         return "Sorry, I couldn't generate destination suggestions at this time. Please try again with different preferences."
 
 
+@lru_cache(maxsize=1)
 def get_destination_tool():
     return Tool(
         name="Destination Suggestion Tool",
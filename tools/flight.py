@@ -1,8 +1,11 @@
 from amadeus import Client, ResponseError
+from functools import lru_cache
 from langchain.tools import Tool
 from os import environ
+from re import compile, IGNORECASE
 from tools.currency import convert_amount
 from utils.set_llm import get_llm
+from utils.ttl_cache import TTLCache
 from prompts import format_prompt, PromptType
 
 
@@ -14,6 +17,13 @@ _amadeus_client = None
 # Cache for airport lookups to avoid repeated API calls
 _airport_cache = {}
 
+# Labels the LLM sometimes puts before the city name, shared prefixes folded into one pass
+_CITY_LABEL_PREFIX_RE = compile(r'^(?:(?:(?:the )?city(?: name| is)?|best city with airport|answer|result)\s*:\s*)+', IGNORECASE)
+_SENTENCE_PUNCT_RE = compile(r'[.?!]')
+
+# Fares move, but a refinement turn minutes later can reuse the same search
+_flight_cache = TTLCache(maxsize=128, ttl=15 * 60)
+
 
 def _resolve_location_intelligently(location: str) -> str:
     """Use LLM to resolve ambiguous locations to major cities with airports"""
@@ -35,16 +45,10 @@ def _resolve_location_intelligently(location: str) -> str:
             city_name = lines[-1]
             
             # Remove common prefixes that might be in the response
-            prefixes_to_remove = [
-                "City name:", "Best city with airport:", "Answer:", 
-                "Result:", "The city is:", "City:"
-            ]
-            for prefix in prefixes_to_remove:
-                if city_name.lower().startswith(prefix.lower()):
-                    city_name = city_name[len(prefix):].strip()
+            city_name = _CITY_LABEL_PREFIX_RE.sub('', city_name).strip()
             
             # Basic validation: city name should be reasonable length
-            if city_name and len(city_name) < 50 and not any(char in city_name for char in ['.', '?', '!']):
+            if city_name and len(city_name) < 50 and not _SENTENCE_PUNCT_RE.search(city_name):
                 return city_name
         
         # If parsing fails, return original location
@@ -174,6 +178,11 @@ def search_flights_from_city(user_city: str, destination_city: str, date: str, a
     if not (user_city and destination_city and date):
         return [{"error": "Please provide your city, destination city, and date (YYYY-MM-DD)."}]
 
+    cache_key = (user_city.strip().lower(), destination_city.strip().lower(), date, adults)
+    cached = _flight_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     # Ensure client exists
     client = _get_client()
     if client is None:
@@ -236,6 +245,8 @@ def search_flights_from_city(user_city: str, destination_city: str, date: str, a
             if results:
                 # Sort by price (cheapest first)
                 results.sort(key=lambda x: x['price'])
+                # Only successful searches are cached, so transient failures are retried
+                _flight_cache.set(cache_key, results)
                 return results
             else:
                 return [{"error": "Found flights but could not parse pricing information."}]
@@ -269,6 +280,7 @@ def _generate_intelligent_error_message(location: str, is_origin: bool = True) -
         return f"I couldn't find an airport for '{location}'. Could you try a nearby major city or provide the airport code directly (like 'DEL' for Delhi)?"
 
 
+@lru_cache(maxsize=1)
 def get_flight_tool() -> Tool:
     return Tool(
         name="Flight Search Tool",
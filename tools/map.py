@@ -1,11 +1,16 @@
 from langchain.tools import Tool
 from os import environ
-from requests import get, RequestException
+from requests import RequestException
+from utils.http import HTTP_SESSION, HTTP_TIMEOUT
 from functools import lru_cache
+from utils.ttl_cache import TTLCache
 
 
 GEOAPIFY_API_KEY = environ.get("GEOAPIFY_API_KEY")
 
+# Points of interest around a place rarely change, so successful searches are kept for a week
+_nearby_cache = TTLCache(maxsize=128, ttl=7 * 24 * 60 * 60)
+
 
 @lru_cache(maxsize=64)
 def _geocode_place(query: str):
@@ -15,7 +20,7 @@ def _geocode_place(query: str):
     params = {"text": query, "limit": 1, "apiKey": GEOAPIFY_API_KEY}
 
     try:
-        r = get(url, params=params, timeout=10)
+        r = HTTP_SESSION.get(url, params=params, timeout=HTTP_TIMEOUT)
         r.raise_for_status()
         data = r.json()
         feats = data.get('features') or []
@@ -32,6 +37,11 @@ def find_nearby_places(location: str, category: str = "tourism") -> str:
     if not GEOAPIFY_API_KEY:
         return "Nearby places search not configured (missing GEOAPIFY_API_KEY)."
 
+    cache_key = (location.strip().lower(), category)
+    cached = _nearby_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     # Geocode first
     coords = _geocode_place(location)
     if not coords:
@@ -47,7 +57,7 @@ def find_nearby_places(location: str, category: str = "tourism") -> str:
         "apiKey": GEOAPIFY_API_KEY
     }
     try:
-        response = get(url, params=params, timeout=15)
+        response = HTTP_SESSION.get(url, params=params, timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         data = response.json()
         feats = data.get('features') or []
@@ -60,11 +70,14 @@ def find_nearby_places(location: str, category: str = "tourism") -> str:
             cat = props.get('categories', [category])[0] if props.get('categories') else category
             addr = props.get('formatted', '')
             lines.append(f"{name} ({cat}) - {addr}")
-        return "\n".join(lines)
+        result = "\n".join(lines)
+        _nearby_cache.set(cache_key, result)
+        return result
     except RequestException as e:
         return f"Error fetching nearby places: {e}"
 
 
+@lru_cache(maxsize=1)
 def get_map_tool() -> Tool:
     return Tool(
         name="Map Tool",
@@ -1,7 +1,8 @@
 from datetime import datetime
 from langchain.tools import Tool
-from requests import get
+from utils.http import HTTP_SESSION, HTTP_TIMEOUT
 from functools import lru_cache
+from utils.ttl_cache import TTLCache
 
 WEATHER_CODE_MAP = {
     0: "Clear sky",
@@ -27,6 +28,10 @@ WEATHER_CODE_MAP = {
     99: "Thunderstorm with heavy hail",
 }
 
+# Forecasts refresh a few times a day; failures are not cached so they are retried
+_weather_cache = TTLCache(maxsize=256, ttl=60 * 60)
+_WEATHER_OK_PREFIXES = ("Weather forecast for", "Current weather in")
+
 
 @lru_cache(maxsize=128)
 def get_lat_lon(city: str):
@@ -37,7 +42,7 @@ def get_lat_lon(city: str):
     params = {"name": city, "count": 1}
 
     try:
-        resp = get(url, params=params, timeout=10)
+        resp = HTTP_SESSION.get(url, params=params, timeout=HTTP_TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
 
@@ -56,7 +61,20 @@ def get_weather(city: str, date: str) -> str:
     """
     Gets weather for the given city and date using Open-Meteo API.
     If forecast is not available for the date, returns current weather.
+    Successful lookups are cached for an hour.
     """
+    cache_key = (city.strip().lower(), date)
+    cached = _weather_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    result = _fetch_weather(city, date)
+    if result.startswith(_WEATHER_OK_PREFIXES):
+        _weather_cache.set(cache_key, result)
+    return result
+
+
+def _fetch_weather(city: str, date: str) -> str:
     lat, lon = get_lat_lon(city)
 
     if lat is None or lon is None:
@@ -65,7 +83,12 @@ def get_weather(city: str, date: str) -> str:
     today = datetime.utcnow().date()
 
     try:
-        trip_date = datetime.strptime(date, "%Y-%m-%d").date()
+        # fromisoformat is implemented in C and skips strptime's regex/locale machinery;
+        # strptime still accepts the unpadded dates fromisoformat rejects (e.g. 2025-1-5)
+        try:
+            trip_date = datetime.fromisoformat(date).date()
+        except ValueError:
+            trip_date = datetime.strptime(date, "%Y-%m-%d").date()
     except Exception:
         return "Invalid date format. Please use YYYY-MM-DD."
 
@@ -78,12 +101,12 @@ def get_weather(city: str, date: str) -> str:
             "longitude": lon,
             "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,weathercode",
             "timezone": "auto",
-            "start_date": date,
-            "end_date": date
+            "start_date": trip_date.isoformat(),
+            "end_date": trip_date.isoformat()
         }
 
         try:
-            resp = get(url, params=params, timeout=10)
+            resp = HTTP_SESSION.get(url, params=params, timeout=HTTP_TIMEOUT)
             resp.raise_for_status()
             data = resp.json()
             daily = data.get("daily", {})
@@ -108,7 +131,7 @@ def get_weather(city: str, date: str) -> str:
     }
 
     try:
-        resp = get(url, params=params, timeout=10)
+        resp = HTTP_SESSION.get(url, params=params, timeout=HTTP_TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
         current = data.get("current_weather", {})
@@ -129,6 +152,7 @@ def get_weather(city: str, date: str) -> str:
         return f"Could not retrieve weather data for {city}."
 
 
+@lru_cache(maxsize=1)
 def get_weather_tool() -> Tool:
     return Tool(
         name="Weather Tool",
@@ -1,25 +1,48 @@
 from agents.conversation_agent import run_conversation_graph
-from asyncio import get_event_loop, new_event_loop, set_event_loop
 from atexit import register
 from concurrent.futures import ThreadPoolExecutor
 from os import path as os_path
 from time import sleep
+from tools.activity import get_activity_tool
+from tools.assembler import get_assembler_tool
+from tools.budget import get_budget_tool
+from tools.flight import get_flight_tool
+from tools.map import get_map_tool
+from tools.weather import get_weather_tool
+from utils.config import BUDGET_LLM_MODEL
+from utils.set_llm import get_llm
 from uuid import uuid4
 from .templates import HTMLTemplates
 import gradio as gr
 
 
+# Upper bound on typing-effect frames so long replies don't add seconds of artificial delay
+_TYPING_MAX_FRAMES = 40
+_TYPING_FRAME_DELAY = 0.03
+
 
 class TripPlannerUI:
     def __init__(self):
         self.run_conversation_graph = run_conversation_graph
-        self.executor = ThreadPoolExecutor(max_workers=3)
+        self.executor = ThreadPoolExecutor(max_workers=1)  # background start-up work only
         # Ensure executor cleans up on process exit
         register(lambda: self.executor.shutdown(wait=False))
 
+        # Build clients and tools while the UI starts, so the first message doesn't pay for it
+        self.executor.submit(self._warm_up)
+
         # Load CSS from external file
         self.custom_css = self._load_css()
 
+    @staticmethod
+    def _warm_up():
+        """Initialize the cached LLM clients and tool singletons"""
+        get_llm()
+        get_llm(model=BUDGET_LLM_MODEL)
+        for get_tool in (get_activity_tool, get_weather_tool, get_flight_tool,
+                         get_map_tool, get_budget_tool, get_assembler_tool):
+            get_tool()
+
     def _load_css(self):
         """Load CSS from external file"""
         css_path = os_path.join(os_path.dirname(__file__), 'styles.css')
@@ -29,25 +52,10 @@ class TripPlannerUI:
         except FileNotFoundError:
             return ""
 
-    async def agent_chat_async(self, prompt, chat_history, context):
-        """Async wrapper for agent chat to prevent UI freezing"""
-        loop = get_event_loop()
-        state = await loop.run_in_executor(
-            self.executor, 
-            self.run_conversation_graph, 
-            prompt, chat_history, context
-        )
-        return state
-
     def agent_chat(self, prompt, chat_history, context):
-        """Sync wrapper for async agent chat"""
+        """Sync agent chat - runs the graph on the calling thread"""
         try:
-            # Run async function in new event loop
-            loop = new_event_loop()
-            set_event_loop(loop)
-            state = loop.run_until_complete(self.agent_chat_async(prompt, chat_history, context))
-            loop.close()
-            return state
+            return self.run_conversation_graph(prompt, chat_history, context)
         except Exception as e:
             return {"response": f"Error processing request: {str(e)}", "missing_info": False}
 
@@ -115,14 +123,13 @@ class TripPlannerUI:
         else:
             response = str(state)
         
-        # Stream the response word-by-word for a natural typing effect
+        # Stream the response in word chunks for a natural typing effect
         words = response.split()
-        partial_words = []
-        for w in words:
-            partial_words.append(w)
-            history[-1]["content"] = " ".join(partial_words).strip()
+        step = max(1, -(-len(words) // _TYPING_MAX_FRAMES))
+        for end in range(step, len(words), step):
+            history[-1]["content"] = " ".join(words[:end])
             yield "", history, context, started_state, thread_id, gr.update()
-            sleep(0.03)
+            sleep(_TYPING_FRAME_DELAY)
         
         # Ensure final response is complete
         history[-1]["content"] = response
@@ -1,2 +1,7 @@
+from os import environ
+
 LLM_MODEL = "mistralai/Mixtral-8x7B-Instruct-v0.1"
 LLM_TEMPERATURE = 0.7  # Higher temp for natural conversations
+BUDGET_LLM_MODEL = environ.get("BUDGET_LLM_MODEL", LLM_MODEL)  # Budget estimation is a narrow task; point at a smaller model to cut latency
+ALLOW_SEMANTIC_CACHE = environ.get("ALLOW_SEMANTIC_CACHE", "").lower() in ("1", "true", "yes")  # Reuse intent labels across reworded messages
+WARM_GRAPH = environ.get("WARM_GRAPH", "1") == "1"  # Compile the conversation graph at import instead of on the first request
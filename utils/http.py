@@ -0,0 +1,24 @@
+"""
+Shared HTTP session for Trip Planner AI
+One pooled, keep-alive session for all external API calls, so repeat requests skip TCP/TLS setup
+"""
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+
+# (connect, read) seconds per request. These calls run inside the planning fan-out, whose
+# batch deadline is 10s, so a tool's calls must fail fast rather than retry past it
+HTTP_TIMEOUT = (2, 3)
+
+
+def _build_session() -> Session:
+    session = Session()
+    # No automatic retries: a retried call can outlive the batch deadline and keep a pool worker busy
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+HTTP_SESSION = _build_session()
@@ -3,13 +3,59 @@ Enhanced Intent Classification System
 Uses LLM as primary method with semantic understanding
 """
 
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
 from typing import Dict, Any, List
+from utils.config import ALLOW_SEMANTIC_CACHE
+from utils.json_extract import extract_json
 from utils.set_llm import get_llm
 from prompts import format_prompt, PromptType
-from json import loads
 import re
 
 
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Bare greetings and sign-offs never need the LLM to be classified as chat
+_SMALLTALK_RE = re.compile(r"(?:hi|hello|hey|thanks|thank you|bye|goodbye)(?: there)?\W*")
+
+# Validated classifications keyed on (normalized input, recent conversation)
+_INTENT_CACHE_MAX = 2048
+_intent_cache: OrderedDict = OrderedDict()
+_intent_cache_lock = Lock()
+
+# Optional second layer: non-plan labels keyed on the message's content words, so reworded
+# requests ("suggest some destinations" / "destinations suggest please") reuse a label.
+# Plan results carry extracted trip details and are never shared across wordings.
+_FILLER_WORDS = frozenset({'a', 'an', 'the', 'please', 'can', 'could', 'would', 'you', 'me', 'i', 'some', 'any', 'just', 'kindly'})
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_signature_cache: OrderedDict = OrderedDict()
+
+
+def _content_signature(normalized_input: str) -> frozenset:
+    """Order-insensitive set of the meaningful words in a message"""
+    return frozenset(word for word in _WORD_RE.findall(normalized_input) if word not in _FILLER_WORDS)
+
+def is_smalltalk(text: str) -> bool:
+    """Whether a message is only a greeting or sign-off"""
+    return bool(_SMALLTALK_RE.fullmatch(_WHITESPACE_RE.sub(' ', text.strip().lower())))
+
+
+def _prior_history(user_input: str, chat_history: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    History before the current message. The UI appends the message being classified to the
+    history it passes in; keeping it would make every cache key unique to the message itself.
+    """
+    if chat_history:
+        last = chat_history[-1]
+        if isinstance(last, dict) and last.get('role') == 'user' and str(last.get('content', '')).strip() == user_input.strip():
+            return chat_history[:-1]
+    return chat_history
+
+# Checked in order, so keep the more specific categories first
+_TRAVEL_QUERY_CATEGORIES = ('weather', 'activities', 'nearby', 'budget', 'flights', 'accommodation', 'food', 'general')
+
+
 class IntelligentIntentClassifier:
     """
     LLM-powered intent classification with semantic understanding
@@ -20,16 +66,30 @@ class IntelligentIntentClassifier:
     def classify_intent(user_input: str, chat_history: List[Dict[str, str]]) -> Dict[str, Any]:
         """
         Primary intent classification using LLM with rich context understanding
+        Validated results are cached, so repeated messages in the same context skip the LLM
         """
-        llm = get_llm(temperature=0.2)  # Low temp for consistent classification
+        normalized_input = _WHITESPACE_RE.sub(' ', user_input.strip().lower())
+        
+        if is_smalltalk(normalized_input):
+            return {'intent': 'chat', 'exploring': None, 'planning_destination': None, 'ready_to_plan': False}
+        
+        # Build conversation context (last 4 messages before this one for better understanding)
+        recent_context = ''.join(
+            f"{msg.get('role', 'unknown')}: {msg.get('content', '')[:150]}\n"
+            for msg in _prior_history(user_input, chat_history)[-4:] if isinstance(msg, dict)
+        )
         
-        # Build conversation context
-        recent_context = ""
-        for msg in chat_history[-4:]:  # More context for better understanding
-            if isinstance(msg, dict):
-                role = msg.get('role', 'unknown')
-                content = msg.get('content', '')
-                recent_context += f"{role}: {content[:150]}\n"
+        cache_key = (normalized_input, recent_context)
+        signature_key = (_content_signature(normalized_input), recent_context) if ALLOW_SEMANTIC_CACHE else None
+        with _intent_cache_lock:
+            if cache_key in _intent_cache:
+                _intent_cache.move_to_end(cache_key)
+                return dict(_intent_cache[cache_key])
+            if signature_key in _signature_cache:
+                _signature_cache.move_to_end(signature_key)
+                return dict(_signature_cache[signature_key])
+        
+        llm = get_llm(temperature=0.2)  # Low temp for consistent classification
         
         prompt = format_prompt(
             PromptType.INTENT_CLASSIFICATION,
@@ -39,18 +99,26 @@ class IntelligentIntentClassifier:
         
         try:
             response = llm.invoke(prompt).content.strip()
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
+            result = extract_json(response)
             
-            if json_match:
-                result = loads(json_match.group())
-                
+            if result is not None:
                 # Enhanced validation and confidence scoring
                 if IntelligentIntentClassifier._validate_classification(result, user_input):
-                    return result
+                    with _intent_cache_lock:
+                        _intent_cache[cache_key] = result
+                        if len(_intent_cache) > _INTENT_CACHE_MAX:
+                            _intent_cache.popitem(last=False)
+                        if signature_key is not None and signature_key[0] and result.get('intent') != 'plan':
+                            _signature_cache[signature_key] = result
+                            if len(_signature_cache) > _INTENT_CACHE_MAX:
+                                _signature_cache.popitem(last=False)
+                    return dict(result)
                     
         except Exception:
-            # Intelligent fallback - still LLM based but with simpler prompt
-            return IntelligentIntentClassifier._intelligent_fallback(user_input, chat_history)
+            pass
+        
+        # Intelligent fallback - still LLM based but with simpler prompt (never cached)
+        return IntelligentIntentClassifier._intelligent_fallback(user_input, chat_history)
 
     @staticmethod
     def _validate_classification(result: Dict[str, Any], user_input: str) -> bool:
@@ -71,10 +139,9 @@ class IntelligentIntentClassifier:
         
         try:
             response = llm.invoke(prompt).content.strip()
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
+            result = extract_json(response)
             
-            if json_match:
-                result = loads(json_match.group())
+            if result is not None:
                 intent = result.get('intent', 'chat')
                 confidence = result.get('confidence', 0.5)
                 
@@ -87,14 +154,16 @@ class IntelligentIntentClassifier:
                 }
 
         except Exception:
-            # Ultimate fallback - assume chat
-            return {
-                'intent': 'chat',
-                'exploring': None,
-                'planning_destination': None,
-                'ready_to_plan': False,
-                'confidence': 0.1
-            }
+            pass
+        
+        # Ultimate fallback - assume chat
+        return {
+            'intent': 'chat',
+            'exploring': None,
+            'planning_destination': None,
+            'ready_to_plan': False,
+            'confidence': 0.1
+        }
 
 
 class SemanticQueryClassifier:
@@ -108,24 +177,28 @@ class SemanticQueryClassifier:
         Classify travel-related queries semantically
         Returns: weather|activities|nearby|budget|flights|accommodation|food|general
         """
+        try:
+            return SemanticQueryClassifier._classify_cached(user_input, context.get('destination', 'Unknown destination'))
+        except Exception:
+            return 'general'  # Safe fallback
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _classify_cached(user_input: str, destination: str) -> str:
+        """LLM classification memoized on the only inputs the prompt uses; LLM errors are not cached"""
         llm = get_llm(temperature=0.2)
         
         # Use centralized semantic query classification prompt
         prompt = format_prompt(
             PromptType.SEMANTIC_QUERY_CLASSIFICATION,
             user_input=user_input,
-            destination=context.get('destination', 'Unknown destination')
+            destination=destination
         )
         
-        try:
-            response = llm.invoke(prompt).content.strip().lower()
-            
-            # Validate response is one of expected categories
-            valid_categories = ['weather', 'activities', 'nearby', 'budget', 'flights', 'accommodation', 'food', 'general']
-            
-            for category in valid_categories:
-                if category in response:
-                    return category
-
-        except Exception as e:
-            return 'general'  # Safe fallback
+        response = llm.invoke(prompt).content.strip().lower()
+        
+        # Validate response is one of expected categories
+        for category in _TRAVEL_QUERY_CATEGORIES:
+            if category in response:
+                return category
+        return 'general'
@@ -0,0 +1,52 @@
+"""
+JSON extraction for LLM responses
+Models often wrap the requested JSON object in prose; pull out and parse just the object
+"""
+
+from json import loads
+from typing import Dict, Any
+
+
+def _find_json_object(text: str) -> str | None:
+    """
+    Return the first balanced {...} span in text, in one linear pass.
+    Braces inside JSON strings (including escaped quotes) are ignored.
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+
+    return None
+
+
+def extract_json(text: str) -> Dict[str, Any] | None:
+    """
+    Parse the JSON object embedded in an LLM response.
+    Returns None when the response contains no complete object; malformed JSON raises ValueError.
+    """
+    blob = _find_json_object(text)
+    if blob is None:
+        return None
+    return loads(blob)
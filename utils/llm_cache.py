@@ -0,0 +1,45 @@
+"""
+LLM response cache for Trip Planner AI
+Bounded, expiring cache of prompt completions, keyed per prompt type on the normalized prompt text
+"""
+
+from re import compile
+from prompts import PromptType
+from utils.set_llm import get_llm
+from utils.ttl_cache import TTLCache
+
+
+_MAX_ENTRIES = 512
+_DEFAULT_TTL = 60 * 60  # 1 hour
+
+# Per-destination suggestions don't depend on the conversation and change slowly
+_TTL_OVERRIDES = {
+    PromptType.DURATION_SUGGESTION: 24 * 60 * 60,
+    PromptType.BEST_TIME_SUGGESTION: 24 * 60 * 60,
+}
+
+_WHITESPACE_RE = compile(r'\s+')
+
+_response_cache = TTLCache(maxsize=_MAX_ENTRIES, ttl=_DEFAULT_TTL)
+
+
+def cached_invoke(prompt_type: PromptType, prompt: str, *, temperature: float | None = None) -> str:
+    """
+    Invoke the LLM with a formatted prompt, reusing the completion for an equivalent prompt.
+    Prompts that differ only in letter case or whitespace share an entry; the LLM still
+    receives the original text on a miss.
+    Entries are keyed by prompt type so different handlers never share results, and
+    expire after an hour (a day for the per-destination suggestions).
+    LLM errors propagate so callers keep their own fallback handling.
+    """
+    key = (prompt_type, temperature, _WHITESPACE_RE.sub(' ', prompt).strip().lower())
+
+    cached = _response_cache.get(key)
+    if cached is not None:
+        return cached
+
+    res = get_llm(temperature=temperature).invoke(prompt)
+    content = str(getattr(res, 'content', res))
+
+    _response_cache.set(key, content, ttl=_TTL_OVERRIDES.get(prompt_type))
+    return content
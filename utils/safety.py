@@ -1,7 +1,6 @@
-from json import loads
-from re import search, DOTALL
 from typing import Dict, Any
 
+from utils.json_extract import extract_json
 from utils.set_llm import get_llm
 from prompts import format_prompt, PromptType
 
@@ -24,11 +23,9 @@ def screen_user_input_safety(user_input: str) -> Dict[str, Any]:
         content = response.content.strip()
         
         # Extract JSON from response
-        json_match = search(r'\{.*\}', content, DOTALL)
-
-        if json_match:
-            safety_result = loads(json_match.group())
+        safety_result = extract_json(content)
 
+        if safety_result is not None:
             # Validate required fields
             if 'is_safe' not in safety_result:
                 safety_result['is_safe'] = True
@@ -65,10 +62,8 @@ def validate_response_safety(response: str, user_context: str = "") -> Dict[str,
         content = response_check.content.strip()
         
         # Extract JSON from response
-        json_match = search(r'\{.*\}', content, DOTALL)
-        if json_match:
-            safety_result = loads(json_match.group())
-            
+        safety_result = extract_json(content)
+        if safety_result is not None:
             # Validate required fields
             if 'is_safe' not in safety_result:
                 safety_result['is_safe'] = True
@@ -124,9 +119,8 @@ def is_sensitive_destination(destination: str) -> bool:
         response = llm.invoke(prompt)
         content = response.content.strip()
         
-        json_match = search(r'\{.*\}', content, DOTALL)
-        if json_match:
-            result = loads(json_match.group())
+        result = extract_json(content)
+        if result is not None:
             return result.get('is_sensitive', False)
             
     except Exception:    
@@ -1,24 +1,60 @@
-from langchain_together import ChatTogether
 from os import environ
+from re import compile
 from utils.config import LLM_MODEL, LLM_TEMPERATURE
 
 
+_CLIENT_CACHE = {}
 _LLM_CACHE = {}
 
+_WORD_END_RE = compile(r'[\s.,!?;:"\']')
+
+
+def _get_client(model: str):
+    """Return the process-wide client for a model, building it on first use"""
+    if model not in _CLIENT_CACHE:
+        # Deferred import: the Together client pulls in a large dependency graph,
+        # so only pay for it once an LLM is actually needed
+        from langchain_together import ChatTogether
+
+        _CLIENT_CACHE[model] = ChatTogether(
+            api_key=environ.get("API_KEY"),
+            temperature=LLM_TEMPERATURE,
+            model=model,
+        )
+
+    return _CLIENT_CACHE[model]
+
 
 def get_llm(*, model: str | None = None, temperature: float | None = None):
     """Return a cached LLM client. Allows per-call overrides for model/temperature.
-    Cache keyed by (model, temperature) to avoid rebuilding for each call.
+    All temperatures for a model share one underlying client (and HTTP connection pool);
+    non-default temperatures are bound as a per-request parameter.
     """
     m = model or LLM_MODEL
     t = LLM_TEMPERATURE if temperature is None else temperature
     key = (m, float(t))
 
     if key not in _LLM_CACHE:
-        _LLM_CACHE[key] = ChatTogether(
-            api_key=environ.get("API_KEY"),
-            temperature=t,
-            model=m,
-        )
+        client = _get_client(m)
+        _LLM_CACHE[key] = client if float(t) == float(LLM_TEMPERATURE) else client.bind(temperature=t)
+
+    return _LLM_CACHE[key]
+
+
+def invoke_first_word(prompt: str, *, temperature: float | None = None) -> str:
+    """Stream a single-label completion (e.g. yes/no) and stop once the first word is complete.
+    Returns that word lowercased, without waiting for the rest of the generation.
+    """
+    text = ''
+    stream = get_llm(temperature=temperature).stream(prompt)
+    try:
+        for chunk in stream:
+            text += str(getattr(chunk, 'content', chunk))
+            word = text.lstrip(' \n"\'')
+            match = _WORD_END_RE.search(word)
+            if match:
+                return word[:match.start()].lower()
+    finally:
+        stream.close()
 
-    return _LLM_CACHE[key]
\ No newline at end of file
+    return text.strip().strip('"\'').lower()